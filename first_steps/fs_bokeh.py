@@ -2,12 +2,27 @@
 Each one is defined as its own function, named as the tutorial.
 """
 
+import json
 import random
+import time
+from typing import Optional, Sequence
 
 import numpy as np
+from bokeh.embed import json_item
 from bokeh.layouts import layout, row
-from bokeh.models import BoxAnnotation, Div, RangeSlider, Spinner
+from bokeh.models import (
+    BoxAnnotation,
+    ColumnDataSource,
+    Div,
+    LinearColorMapper,
+    RangeSlider,
+    Spinner,
+)
 from bokeh.plotting import figure, show
+from bokeh.transform import linear_cmap
+
+# Same colors as 'vectorizing_glyph_properties', from '#ff00ff' (y=0) to '#ffffff'.
+MAGENTA_TO_WHITE = tuple(f"#ff{val:02x}ff" for val in range(256))
 
 
 def create_a_simple_line_chart() -> figure:
@@ -123,6 +138,85 @@ def vectorizing_glyph_properties():
     return p
 
 
+def large_vectorized_glyphs(
+    size: int = 1_000_000, bins: Optional[int] = None, seed: int = 0
+) -> figure:
+    """Version of 'vectorizing_glyph_properties' able to render millions of points.
+
+    Modifications
+    -------------
+    - The colors are not computed in python: 'y' is sent within a ColumnDataSource
+      and mapped to the palette by the browser with 'linear_cmap'.
+    - The data is kept as float32 NumPy arrays, which Bokeh transports as binary
+      buffers instead of lists of numbers.
+    - The plot is rendered with WebGL and the points have no outline.
+    - The per-point radii are dropped: all points are drawn with a fixed screen size,
+      which avoids sending one more array and keeps the points visible when zooming.
+    - If 'bins' is given, the points are pre-aggregated into a 'bins' x 'bins' density
+      image, so the size of the plot no longer depends on the number of points.
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random(size, dtype=np.float32)
+    x *= 100
+    y = rng.random(size, dtype=np.float32)
+    y *= 100
+
+    p = figure(
+        title=f"Vectorized colors example ({size:,} points)",
+        sizing_mode="stretch_width",
+        max_width=500,
+        height=250,
+        x_range=(0, 100),
+        y_range=(0, 100),
+        output_backend="webgl",
+    )
+
+    if bins is None:
+        source = ColumnDataSource(data={"x": x, "y": y})
+        p.scatter(
+            "x",
+            "y",
+            source=source,
+            marker="circle",
+            size=3,
+            fill_color=linear_cmap("y", MAGENTA_TO_WHITE, 0, 100),
+            fill_alpha=0.6,
+            line_color=None,
+        )
+    else:
+        counts, _, _ = np.histogram2d(x, y, bins=bins, range=[[0, 100], [0, 100]])
+        mapper = LinearColorMapper(
+            palette="Viridis256", low=0, high=max(counts.max(), 1)
+        )
+        # 'histogram2d' indexes as [x, y], while images are indexed as [row, column].
+        p.image(image=[counts.T], x=0, y=0, dw=100, dh=100, color_mapper=mapper)
+    return p
+
+
+def benchmark_large_vectorized_glyphs(
+    sizes: Sequence[int] = (1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    bins: Optional[int] = None,
+) -> None:
+    """Prints the time to generate and to serialize 'large_vectorized_glyphs'.
+    The serialization is the one done by Bokeh before sending the plot to the
+    browser, so its size is also printed.
+    """
+    print(f"{'points':>12} {'generation (s)':>15} {'serialization (s)':>18} {'MB':>8}")
+    for size in sizes:
+        start = time.perf_counter()
+        p = large_vectorized_glyphs(size=size, bins=bins)
+        generation = time.perf_counter() - start
+
+        start = time.perf_counter()
+        payload = json.dumps(json_item(p))
+        serialization = time.perf_counter() - start
+
+        print(
+            f"{size:>12,} {generation:>15.3f} {serialization:>18.3f}"
+            f" {len(payload) / 1e6:>8.1f}"
+        )
+
+
 def combining_plots() -> row:
     """https://docs.bokeh.org/en/latest/docs/first_steps/first_steps_6.html"""
     x = list(range(11))
@@ -5,6 +5,8 @@ script is re-run, then the table will be updated again.
 """
 
 import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Tuple
 
 # Connect to SQLite database (or create it).
 conn = sqlite3.connect("inventory.db")
@@ -79,6 +81,106 @@ def delete_product(product_name: str):
         print(f"Product '{product_name}' not found.")
 
 
+@contextmanager
+def _transaction() -> Iterator[None]:
+    """Running all the statements within a single, explicit transaction.
+    Everything is committed at the end, or rolled back if any error is raised.
+    """
+    cursor.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def _is_valid_quantity(quantity: object) -> bool:
+    """Checking in python the constraints of the 'quantity' column."""
+    return isinstance(quantity, int) and not isinstance(quantity, bool)
+
+
+def _is_valid_product(name: object, price: object, quantity: object) -> bool:
+    """Checking in python all the constraints of the 'products' table columns."""
+    return (
+        isinstance(name, str)
+        and isinstance(price, (int, float))
+        and not isinstance(price, bool)
+        and price > 0
+        and _is_valid_quantity(quantity)
+    )
+
+
+def add_products(products: Iterable[Tuple[str, float, int]]) -> List[str]:
+    """Inserting many products at once, within a single transaction.
+    Each product is a tuple (name, price, quantity). If a product with the same name
+    already exists, its price and quantity are overwritten (upsert).
+    Returns the outcome of each product, in the same order: 'inserted', 'updated' or
+    'invalid' (skipped for not satisfying the constraints of the table).
+
+    The 'AUTOINCREMENT' never reuses an 'id', so a product is new only if the 'id'
+    returned by the upsert is greater than the last 'id' ever given.
+    """
+    outcomes = []
+    with _transaction():
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'products'")
+        row = cursor.fetchone()
+        last_id = row[0] if row else 0
+        for name, price, quantity in products:
+            if not _is_valid_product(name, price, quantity):
+                outcomes.append("invalid")
+                continue
+            cursor.execute(
+                """
+                INSERT INTO products (name, price, quantity) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    price = excluded.price,
+                    quantity = excluded.quantity
+                RETURNING id
+                """,
+                (name, price, quantity),
+            )
+            product_id = cursor.fetchone()[0]
+            if product_id > last_id:
+                outcomes.append("inserted")
+                last_id = product_id
+            else:
+                outcomes.append("updated")
+    return outcomes
+
+
+def update_products(updates: Iterable[Tuple[int, int]]) -> List[str]:
+    """Updating the quantity of many products at once, within a single transaction.
+    Each update is a tuple (product_id, new_quantity).
+    Returns the outcome of each update, in the same order: 'updated', 'not found' or
+    'invalid' (skipped for not satisfying the constraints of the 'quantity' column).
+    """
+    outcomes = []
+    with _transaction():
+        for product_id, quantity in updates:
+            if not _is_valid_quantity(quantity):
+                outcomes.append("invalid")
+                continue
+            cursor.execute(
+                "UPDATE products SET quantity = ? WHERE id = ?", (quantity, product_id)
+            )
+            outcomes.append("updated" if cursor.rowcount else "not found")
+    return outcomes
+
+
+def delete_products(product_names: Iterable[str]) -> List[str]:
+    """Removing many products at once by their name, within a single transaction.
+    Returns the outcome of each name, in the same order: 'deleted' or 'not found'.
+    """
+    outcomes = []
+    with _transaction():
+        for name in product_names:
+            cursor.execute("DELETE FROM products WHERE name = ?", (name,))
+            outcomes.append("deleted" if cursor.rowcount else "not found")
+    return outcomes
+
+
 # Example usage
 if __name__ == "__main__":
     # Adding initial products
@@ -100,3 +202,10 @@ if __name__ == "__main__":
     # Adding a new product after having other deleted (see the new value of 'id')
     add_product("Keyboard", 80.00, 15)
     print("Products after new addition:", get_products())
+
+    # Batch operations: a single transaction for all the rows
+    print(add_products([("Mouse", 25.0, 40), ("Laptop", 899.99, 8), ("Bad", -1, 1)]))
+    print(add_products([("Pen", 1.5, 100), ("Pen", 1.25, 90), ("Bad", 5.0, None)]))
+    print(update_products([(1, 7), ("1", 6), (999, 1), (1, None)]))
+    print(delete_products(["Mouse", "Mouse", "Tablet"]))
+    print("Products after batch operations:", get_products())
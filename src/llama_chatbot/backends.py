@@ -0,0 +1,115 @@
+"""Backends.
+
+A backend is the piece of the chatbot that talks to the language model. The
+'ChatBot' only depends on the 'ChatBackend' interface, so the remote Replicate
+service can be swapped by the 'LocalBackend' to run the bot offline (for example,
+to benchmark or to load-test it).
+"""
+
+import abc
+import os
+import time
+from typing import Iterator, List, Optional
+
+
+class ChatBackend(abc.ABC):
+    """Interface that any chatbot backend must implement."""
+
+    @abc.abstractmethod
+    def stream(self, model: str, prompt: str, system_prompt: str) -> Iterator[str]:
+        """Yields the tokens of the model answer as they are generated.
+
+        Parameters
+        ----------
+        model : str
+            Name of the model to be run.
+        prompt : str
+            Message of the user.
+        system_prompt : str
+            Instructions defining the behaviour of the model.
+        """
+
+    @abc.abstractmethod
+    def list_models(self) -> List:
+        """Returns the models available at the backend."""
+
+
+class ReplicateBackend(ChatBackend):
+    def __init__(self, api_token: Optional[str] = None):
+        """
+        Backend running the models remotely at Replicate.
+
+        Parameters
+        ----------
+        api_token : str
+            Provided API token or key by Replicate. If not provided, the token is
+            searched as an environment variable with the name 'REPLICATE_TOKEN' or
+            'API_TOKEN'.
+            Users can generate it at: https://replicate.com/account
+        """
+        if api_token is None:
+            api_token = os.getenv("API_TOKEN", os.getenv("REPLICATE_TOKEN"))
+
+        if api_token is None:
+            raise ValueError(
+                "The bot needs of a Replicate token to work. Please, provide it"
+                " manually or as an environment variable under the name 'API_TOKEN'"
+                " or 'REPLICATE_TOKEN'."
+            )
+
+        # Imported here so 'replicate' is only required when this backend is used.
+        import replicate  # noqa: PLC0415
+
+        self._client = replicate.Client(api_token=api_token)
+
+    def stream(self, model: str, prompt: str, system_prompt: str) -> Iterator[str]:
+        """Yields the tokens returned by Replicate."""
+        yield from self._client.run(
+            model, input={"prompt": prompt, "system_prompt": system_prompt}
+        )
+
+    def list_models(self) -> List:
+        """Returns the models listed by Replicate."""
+        return list(self._client.models.list())
+
+
+class LocalBackend(ChatBackend):
+    def __init__(
+        self,
+        first_token_latency: float = 0.0,
+        token_latency: float = 0.0,
+        models: Optional[List[str]] = None,
+    ):
+        """
+        Deterministic in-process backend. No model is run: the answer is always
+        built from the prompt, and the generation time is simulated with sleeps.
+
+        Parameters
+        ----------
+        first_token_latency : float
+            Seconds to wait before yielding the first token.
+        token_latency : float
+            Seconds to wait between two consecutive tokens.
+        models : list of str, optional
+            Names returned as available models. Defaults to a single 'local/echo'.
+        """
+        if first_token_latency < 0 or token_latency < 0:
+            raise ValueError("The simulated latencies cannot be negative.")
+
+        self._first_token_latency = first_token_latency
+        self._token_latency = token_latency
+        self._models = models if models is not None else ["local/echo"]
+
+    def stream(self, model: str, prompt: str, system_prompt: str) -> Iterator[str]:
+        """Yields the words of an answer echoing the prompt, one by one."""
+        answer = (
+            f"You said '{prompt}' to {model}, following {len(system_prompt)}"
+            " characters of instructions, and that is no joke!"
+        )
+        for idx, word in enumerate(answer.split(" ")):
+            time.sleep(self._first_token_latency if idx == 0 else self._token_latency)
+            yield word if idx == 0 else f" {word}"
+
+    def list_models(self) -> List[str]:
+        """Returns the configured model names."""
+        return list(self._models)
@@ -1,13 +1,21 @@
 """Bot."""
 
-import os
-from typing import Optional
+import time
+from typing import Optional, Tuple
 
-import replicate
+from backends import ChatBackend, ReplicateBackend
+from metrics import CallMetrics, MetricsRegistry
 
 
 class ChatBot:
-    def __init__(self, api_token: Optional[str] = None):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        backend: Optional[ChatBackend] = None,
+        model: str = "meta/llama-2-70b-chat",
+        models_ttl: float = 300.0,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
         """
         Initializes the chatbot.
 
@@ -18,19 +26,28 @@ class ChatBot:
             searched as an environment variable with the name 'REPLICATE_TOKEN' or
             'API_TOKEN'.
             Users can generate it at: https://replicate.com/account
+            It is ignored when a 'backend' is given.
+        backend : ChatBackend, optional
+            Backend running the model. Defaults to a 'ReplicateBackend'.
+        model : str
+            Name of the model to be run by the backend.
+        models_ttl : float
+            Seconds during which the listing of the 'models' property is cached.
+        metrics : MetricsRegistry, optional
+            Registry where every call is recorded. A new one is created if not given.
         """
-        if api_token is None:
-            api_token = os.getenv("API_TOKEN", os.getenv("REPLICATE_TOKEN"))
+        if models_ttl < 0:
+            raise ValueError("The 'models_ttl' cannot be negative.")
 
-        if api_token is None:
-            raise ValueError(
-                "The bot needs of a Replicate token to work. Please, provide it"
-                " manually or as an environment variable under the name 'API_TOKEN'"
-                " or 'REPLICATE_TOKEN'."
-            )
+        if backend is None:
+            backend = ReplicateBackend(api_token=api_token)
 
-        self._model = "meta/llama-2-70b-chat"
-        self._client = replicate.Client(api_token=api_token)
+        self._model = model
+        self._backend = backend
+        self._models_ttl = models_ttl
+        self._models_cache: Optional[Tuple] = None
+        self._models_expiry = 0.0
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
 
         system_prompt = (
             "You are a helpful, ans witty assistant, always answering with a joke. "
@@ -50,11 +67,32 @@ class ChatBot:
 
     def get_response(self, prompt: str):
         self._params["prompt"] = prompt
-        response = self._client.run(
-            self._model,
-            input={"prompt": prompt, "system_prompt": self._params["system_prompt"]},
-        )
-        return "".join(response)
+        tokens = []
+        time_to_first_token = None
+        error = None
+        start = time.perf_counter()
+        try:
+            for token in self._backend.stream(
+                self._model, prompt, self._params["system_prompt"]
+            ):
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                tokens.append(token)
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            self.metrics.record(
+                CallMetrics(
+                    model=self._model,
+                    prompt_chars=len(prompt),
+                    time_to_first_token=time_to_first_token,
+                    total_latency=time.perf_counter() - start,
+                    nof_tokens=len(tokens),
+                    error=error,
+                )
+            )
+        return "".join(tokens)
 
     @staticmethod
     def fit_length_response(response: str, limit_nof_characters: int = 88) -> str:
@@ -71,8 +109,12 @@ class ChatBot:
         return fit_response
 
     @property
-    def models(self):
-        return self._client.models.list()
+    def models(self) -> Tuple:
+        now = time.monotonic()
+        if self._models_cache is None or now >= self._models_expiry:
+            self._models_cache = tuple(self._backend.list_models())
+            self._models_expiry = now + self._models_ttl
+        return self._models_cache
 
     def run_on_terminal(self) -> None:
         while True:
@@ -0,0 +1,221 @@
+"""Metrics.
+
+In-process instrumentation of the chatbot calls. Each call to the bot is recorded
+as a 'CallMetrics' into a 'MetricsRegistry', which aggregates them into histograms
+and counters per model. The registry can be exported as JSON or in the Prometheus
+text format, and custom sinks can be attached to receive every single record.
+"""
+
+import bisect
+import json
+import logging
+import math
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKENS_PER_SECOND_BUCKETS = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0)
+SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CallMetrics:
+    """Measurements of a single call to the bot.
+
+    Attributes
+    ----------
+    model : str
+        Name of the model that was called.
+    prompt_chars : int
+        Length of the prompt, in characters.
+    time_to_first_token : float, optional
+        Seconds until the first token was received. None if no token arrived.
+    total_latency : float
+        Seconds until the call finished (or failed).
+    nof_tokens : int
+        Number of tokens received.
+    error : str, optional
+        Name of the exception raised by the call, if any.
+    """
+
+    model: str
+    prompt_chars: int
+    time_to_first_token: Optional[float]
+    total_latency: float
+    nof_tokens: int
+    error: Optional[str] = None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generation speed, measured from the first token until the last one.
+        None when it cannot be computed (e.g. less than two tokens were received).
+        """
+        if self.nof_tokens < 2 or self.time_to_first_token is None:
+            return None
+        generation_time = self.total_latency - self.time_to_first_token
+        if generation_time <= 0:
+            return None
+        return (self.nof_tokens - 1) / generation_time
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Cumulative histogram with fixed upper bounds, as used by Prometheus.
+
+        Parameters
+        ----------
+        buckets : sequence of float
+            Sorted upper bounds of the buckets. The '+Inf' bucket is always added.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Adds a value to the histogram."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict:
+        """Returns the cumulative counts per upper bound, the sum and the count."""
+        cumulative = {}
+        total = 0
+        for bound, count in zip((*self.buckets, math.inf), self.counts, strict=True):
+            total += count
+            cumulative["+Inf" if bound == math.inf else str(bound)] = total
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+def _new_series() -> Dict:
+    """Creates the counters and histograms recorded for a single model."""
+    return {
+        "counters": {"calls_total": 0, "errors_total": 0},
+        "histograms": {
+            "time_to_first_token_seconds": Histogram(LATENCY_BUCKETS),
+            "latency_seconds": Histogram(LATENCY_BUCKETS),
+            "tokens_per_second": Histogram(TOKENS_PER_SECOND_BUCKETS),
+            "prompt_chars": Histogram(SIZE_BUCKETS),
+            "response_tokens": Histogram(SIZE_BUCKETS),
+        },
+    }
+
+
+def _escape_label(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "chatbot"):
+        """
+        Registry aggregating the metrics of all the calls to the bot, per model.
+        Only the prompt size and the counters include the failed calls: the latency,
+        throughput and token histograms only contain successful calls.
+
+        Parameters
+        ----------
+        prefix : str
+            Prefix of the metric names when exported.
+        """
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._sinks: List[Callable[[CallMetrics], None]] = []
+        self._series: Dict[str, Dict] = {}
+
+    def add_sink(self, sink: Callable[[CallMetrics], None]) -> None:
+        """Registers a callable that receives every recorded 'CallMetrics'.
+        Exceptions raised by the sink are logged and never reach the caller.
+        """
+        self._sinks.append(sink)
+
+    def record(self, call: CallMetrics) -> None:
+        """Aggregates the measurements of a call and forwards them to the sinks."""
+        with self._lock:
+            if call.model not in self._series:
+                self._series[call.model] = _new_series()
+            series = self._series[call.model]
+            counters, histograms = series["counters"], series["histograms"]
+            counters["calls_total"] += 1
+            histograms["prompt_chars"].observe(call.prompt_chars)
+            if call.error is not None:
+                counters["errors_total"] += 1
+            else:
+                if call.time_to_first_token is not None:
+                    histograms["time_to_first_token_seconds"].observe(
+                        call.time_to_first_token
+                    )
+                histograms["latency_seconds"].observe(call.total_latency)
+                if call.tokens_per_second is not None:
+                    histograms["tokens_per_second"].observe(call.tokens_per_second)
+                histograms["response_tokens"].observe(call.nof_tokens)
+
+        for sink in self._sinks:
+            try:
+                sink(call)
+            except Exception:
+                logger.exception("Metrics sink %r failed", sink)
+
+    def to_dict(self) -> Dict:
+        """Returns a snapshot of all the counters and histograms, keyed by model."""
+        with self._lock:
+            return {
+                model: {
+                    "counters": dict(series["counters"]),
+                    "histograms": {
+                        name: hist.to_dict()
+                        for name, hist in series["histograms"].items()
+                    },
+                }
+                for model, series in self._series.items()
+            }
+
+    def to_json(self, **kwargs) -> str:
+        """Exports the registry as JSON. Keyword arguments go to 'json.dumps'."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """Exports the registry in the Prometheus text exposition format.
+        Each series is labelled with the name of its model.
+        """
+        snapshot = self.to_dict()
+        lines = []
+        for name in _new_series()["counters"]:
+            metric = f"{self._prefix}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for model, series in snapshot.items():
+                label = f'model="{_escape_label(model)}"'
+                lines.append(f"{metric}{{{label}}} {series['counters'][name]}")
+        for name in _new_series()["histograms"]:
+            metric = f"{self._prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for model, series in snapshot.items():
+                label = f'model="{_escape_label(model)}"'
+                hist = series["histograms"][name]
+                lines.extend(
+                    f'{metric}_bucket{{{label},le="{bound}"}} {count}'
+                    for bound, count in hist["buckets"].items()
+                )
+                lines.extend(
+                    (
+                        f"{metric}_sum{{{label}}} {hist['sum']}",
+                        f"{metric}_count{{{label}}} {hist['count']}",
+                    )
+                )
+        return "\n".join(lines) + "\n"
+
+
+def json_lines_sink(path: str) -> Callable[[CallMetrics], None]:
+    """Creates a sink appending every call as a JSON line to the given file."""
+
+    def sink(call: CallMetrics) -> None:
+        with open(path, "a", encoding="utf-8") as file:
+            record = {**asdict(call), "tokens_per_second": call.tokens_per_second}
+            file.write(json.dumps(record) + "\n")
+
+    return sink